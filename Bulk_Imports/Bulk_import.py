@@ -2,7 +2,7 @@ import sqlite3
 import csv
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, date
 
 # Ensure the script always runs in the folder where the Python file is located
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -57,6 +57,22 @@ def create_database():
             status TEXT DEFAULT 'Approved',
             FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE
         );
+
+        CREATE INDEX IF NOT EXISTS idx_annual_emp_status
+            ON annualLeave(employee_id, status, days_used);
+
+        DROP INDEX IF EXISTS idx_sick_emp_status;
+        CREATE INDEX idx_sick_emp_status
+            ON sickLeave(employee_id, status, start_date, days_used);
+
+        CREATE INDEX IF NOT EXISTS idx_emp_archived
+            ON employees(is_archived, name);
+
+        CREATE INDEX IF NOT EXISTS idx_annual_approved
+            ON annualLeave(employee_id, days_used) WHERE status = 'Approved';
+
+        CREATE INDEX IF NOT EXISTS idx_sick_approved
+            ON sickLeave(employee_id, start_date, days_used) WHERE status = 'Approved';
     """)
     con.commit()
     return con
@@ -70,7 +86,13 @@ def clean_date(date_str):
 
     date_str = str(date_str).strip()
 
-    formats = ["%d/%m/%Y", "%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d"]
+    # Fast path: already ISO formatted (C parser, much quicker than strptime)
+    try:
+        return date.fromisoformat(date_str).isoformat()
+    except ValueError:
+        pass
+
+    formats = ["%d/%m/%Y", "%m/%d/%Y", "%Y/%m/%d"]
     for fmt in formats:
         try:
             return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
@@ -131,15 +153,10 @@ def create_csv_templates():
 
 
 # --- Import Logic ---
-def get_employee_pk(cursor, emp_string_id):
-    """Finds internal DB ID from string Employee ID."""
-    if not emp_string_id:
-        return None
-    cursor.execute(
-        "SELECT id FROM employees WHERE employee_id = ?", (emp_string_id.strip(),)
-    )
-    result = cursor.fetchone()
-    return result[0] if result else None
+def load_employee_pk_map(cursor):
+    """Loads all string Employee ID -> internal DB ID pairs in one query."""
+    cursor.execute("SELECT employee_id, id FROM employees")
+    return {emp_string_id: pk for emp_string_id, pk in cursor.fetchall()}
 
 
 # Helper to remove accidental leading spaces in CSV headers
@@ -156,7 +173,7 @@ def run_import_process(conn):
         # utf-8-sig strips hidden Excel BOM characters
         with open("employees.csv", mode="r", encoding="utf-8-sig") as f:
             reader = csv.DictReader(f)
-            count = 0
+            rows = []
             for raw_row in reader:
                 row = strip_dict_keys(raw_row)
                 if not row.get("employee_id"):
@@ -167,39 +184,45 @@ def run_import_process(conn):
                     is_archived = (
                         row.get("is_archived") if row.get("is_archived") != "" else 0
                     )
-
-                    cursor.execute(
-                        "INSERT INTO employees (name, employee_id, hire_date, is_archived) VALUES (?, ?, ?, ?)",
-                        (row["name"], row["employee_id"], hire_date, is_archived),
+                    rows.append(
+                        (row["name"], row["employee_id"], hire_date, is_archived)
                     )
-                    count += 1
-                except sqlite3.IntegrityError:
-                    print(f"   - ⚠️  Skipped duplicate: {row.get('employee_id')}")
                 except Exception as e:
                     print(f"   - ❌ Error on row {row}: {e}")
+
+            # One executemany runs the prepared INSERT once per row without
+            # re-entering Python between rows; OR IGNORE skips duplicates
+            cursor.executemany(
+                "INSERT OR IGNORE INTO employees (name, employee_id, hire_date, is_archived) VALUES (?, ?, ?, ?)",
+                rows,
+            )
             conn.commit()
-            print(f"✅ Processed {count} employees.")
+            skipped = len(rows) - cursor.rowcount
+            if skipped:
+                print(f"   - ⚠️  Skipped {skipped} duplicate employee ID(s).")
+            print(f"✅ Processed {cursor.rowcount} employees.")
+
+    # One lookup table instead of a SELECT per leave row below
+    emp_pk_map = load_employee_pk_map(cursor)
 
     # 2. Import Annual Leave
     if os.path.exists("annual_leave.csv"):
         print("\n📥 Importing Annual Leave...")
         with open("annual_leave.csv", mode="r", encoding="utf-8-sig") as f:
             reader = csv.DictReader(f)
-            count = 0
+            rows = []
             for raw_row in reader:
                 row = strip_dict_keys(raw_row)
                 if not row.get("employee_id"):
                     continue
 
-                emp_pk = get_employee_pk(cursor, row["employee_id"])
+                emp_pk = emp_pk_map.get(row["employee_id"])
                 if emp_pk:
                     try:
                         start = clean_date(row.get("start_date"))
                         end = clean_date(row.get("end_date"))
                         status = row.get("status") if row.get("status") else "Approved"
-
-                        cursor.execute(
-                            "INSERT INTO annualLeave (employee_id, start_date, end_date, reason, days_used, status) VALUES (?, ?, ?, ?, ?, ?)",
+                        rows.append(
                             (
                                 emp_pk,
                                 start,
@@ -207,38 +230,39 @@ def run_import_process(conn):
                                 row.get("reason", ""),
                                 row.get("days_used", 0),
                                 status,
-                            ),
+                            )
                         )
-                        count += 1
                     except Exception as e:
                         print(f"   - ❌ Error on row {row}: {e}")
                 else:
                     print(
                         f"   - ⚠️  Skipping: Employee ID '{row['employee_id']}' not found in Database."
                     )
+            cursor.executemany(
+                "INSERT INTO annualLeave (employee_id, start_date, end_date, reason, days_used, status) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
             conn.commit()
-            print(f"✅ Processed {count} annual leave records.")
+            print(f"✅ Processed {len(rows)} annual leave records.")
 
     # 3. Import Sick Leave
     if os.path.exists("sick_leave.csv"):
         print("\n📥 Importing Sick Leave...")
         with open("sick_leave.csv", mode="r", encoding="utf-8-sig") as f:
             reader = csv.DictReader(f)
-            count = 0
+            rows = []
             for raw_row in reader:
                 row = strip_dict_keys(raw_row)
                 if not row.get("employee_id"):
                     continue
 
-                emp_pk = get_employee_pk(cursor, row["employee_id"])
+                emp_pk = emp_pk_map.get(row["employee_id"])
                 if emp_pk:
                     try:
                         start = clean_date(row.get("start_date"))
                         end = clean_date(row.get("end_date"))
                         status = row.get("status") if row.get("status") else "Approved"
-
-                        cursor.execute(
-                            "INSERT INTO sickLeave (employee_id, start_date, end_date, reason, days_used, medical_cert, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows.append(
                             (
                                 emp_pk,
                                 start,
@@ -247,17 +271,20 @@ def run_import_process(conn):
                                 row.get("days_used", 0),
                                 row.get("medical_cert", ""),
                                 status,
-                            ),
+                            )
                         )
-                        count += 1
                     except Exception as e:
                         print(f"   - ❌ Error on row {row}: {e}")
                 else:
                     print(
                         f"   - ⚠️  Skipping: Employee ID '{row['employee_id']}' not found in Database."
                     )
+            cursor.executemany(
+                "INSERT INTO sickLeave (employee_id, start_date, end_date, reason, days_used, medical_cert, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
             conn.commit()
-            print(f"✅ Processed {count} sick leave records.")
+            print(f"✅ Processed {len(rows)} sick leave records.")
 
 
 # --- Main Menu ---
@@ -6,16 +6,43 @@ from flask import (
     redirect,
     url_for,
     session,
-    send_file,
+    send_from_directory,
+    g,
+    has_request_context,
+    Response,
+    stream_with_context,
 )
+from werkzeug.exceptions import NotFound
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from functools import wraps
-from datetime import datetime, timedelta
+from datetime import datetime, date
 import sqlite3
+import queue
 import os
+import shutil
+
+try:
+    import orjson
+except ImportError:  # fall back to Flask's stdlib-json provider
+    orjson = None
 
 app = Flask(__name__)
+
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class ORJSONProvider(JSONProvider):
+        """JSON provider backed by orjson's C serializer (~3-5x faster
+        than stdlib json on the large list responses)"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=str).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
 # Make folder for database
 folder_path = "Database"
 os.makedirs(folder_path, exist_ok=True)
@@ -29,25 +56,240 @@ app.config["MAX_CONTENT_LENGTH"] = 5 * 1024 * 1024  # 5MB max file size
 # Create uploads directory if it doesn't exist
 os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
-ALLOWED_EXTENSIONS = {"pdf", "jpg", "jpeg", "png", "doc", "docx"}
+# Absolute upload dir, resolved once; the trailing separator makes the
+# containment check in download_file exact (no "uploads_evil" prefix match)
+UPLOAD_DIR_ABS = os.path.abspath(app.config["UPLOAD_FOLDER"]) + os.sep
+
+ALLOWED_EXTENSIONS = frozenset({"pdf", "jpg", "jpeg", "png", "doc", "docx"})
+
+# New hashes use scrypt explicitly: verification goes through OpenSSL's C
+# implementation instead of the pure-iteration pbkdf2 default, and existing
+# pbkdf2 hashes still verify (check_password_hash reads the method prefix)
+PASSWORD_HASH_METHOD = "scrypt"
+
+# Verified against when a username doesn't exist, so the unknown-user and
+# wrong-password paths of /login take the same time (no timing oracle)
+DUMMY_PASSWORD_HASH = generate_password_hash(
+    "timing-equalizer", method=PASSWORD_HASH_METHOD
+)
+
+# Hot write-path SQL kept as module constants so the exact same statement
+# text hits sqlite3's per-connection statement cache on every call
+SQL_INSERT_EMPLOYEE = """INSERT INTO employees (name, employee_id, hire_date)
+						 VALUES (?, ?, ?)"""
+SQL_UPDATE_EMPLOYEE = """UPDATE employees
+						 SET name = ?, employee_id = ?, hire_date = ?
+						 WHERE id = ?
+						 RETURNING id, name, employee_id, hire_date"""
+SQL_INSERT_ANNUAL = """INSERT INTO annualLeave (employee_id, start_date, end_date, reason, days_used, status)
+					   VALUES (?, ?, ?, ?, ?, ?)"""
+SQL_UPDATE_ANNUAL = """UPDATE annualLeave
+					   SET start_date = ?, end_date = ?, reason = ?, days_used = ?, status = ?
+					   WHERE id = ?
+					   RETURNING id, employee_id, start_date, end_date, reason, days_used, status"""
+SQL_DELETE_ANNUAL = "DELETE FROM annualLeave WHERE id = ?"
+SQL_INSERT_SICK = """INSERT INTO sickLeave (employee_id, start_date, end_date, reason, days_used, medical_cert, status)
+					 VALUES (?, ?, ?, ?, ?, ?, ?)"""
+SQL_UPDATE_SICK = """UPDATE sickLeave
+					 SET start_date = ?, end_date = ?, reason = ?, days_used = ?, medical_cert = ?, status = ?
+					 WHERE id = ?
+					 RETURNING id, employee_id, start_date, end_date, reason, days_used, medical_cert, status"""
+SQL_DELETE_SICK = "DELETE FROM sickLeave WHERE id = ? RETURNING medical_cert"
+
+# Shared base SELECTs for the leave list endpoints; the employee_id filter
+# is appended when present. An inner JOIN replaces the old LEFT JOIN: the
+# is_archived predicate already discarded unmatched rows, and the planner
+# can now drive from either table
+SQL_SELECT_ANNUAL = """SELECT a.id, a.employee_id, e.name as employee_name, a.start_date, a.end_date,
+							  a.reason, a.days_used, a.status
+					   FROM annualLeave a
+					   JOIN employees e ON a.employee_id = e.id
+					   WHERE e.is_archived = 0"""
+SQL_SELECT_SICK = """SELECT s.id, s.employee_id, e.name as employee_name, s.start_date, s.end_date,
+							s.reason, s.days_used, s.medical_cert, s.status
+					 FROM sickLeave s
+					 JOIN employees e ON s.employee_id = e.id
+					 WHERE e.is_archived = 0"""
+
+
+def stream_json_rows(cursor):
+    """Stream a cursor as a JSON array without materializing all rows.
+
+    Iterating the cursor uses SQLite's step-at-a-time API, so peak memory
+    stays flat however many rows the query returns.
+    """
+
+    def generate():
+        # Column names come off cursor.description once; dict(zip(...))
+        # then skips the per-row keys() list sqlite3.Row would allocate
+        keys = tuple(d[0] for d in cursor.description)
+        dumps = app.json.dumps
+        yield "["
+        first = True
+        for row in cursor:
+            if first:
+                first = False
+            else:
+                yield ","
+            yield dumps(dict(zip(keys, row)))
+        yield "]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+def _rows_to_dicts(rows):
+    """Convert same-shaped sqlite3.Rows to dicts, fetching the keys once"""
+    if not rows:
+        return []
+    keys = tuple(rows[0].keys())
+    return [dict(zip(keys, row)) for row in rows]
+
+
+# Resolve the page templates once at import time so views skip the
+# per-request loader lookup and go straight to the compiled Template
+_tpl_login = app.jinja_env.get_template("login.html")
+_tpl_change_password = app.jinja_env.get_template("change_password.html")
+_tpl_index = app.jinja_env.get_template("index.html")
+
+
+def render_cached(template, **context):
+    """Render a pre-resolved Template with Flask's standard context.
+
+    Applies the same context processors render_template would (session,
+    g, config, ...) but without re-looking the template up by name. In
+    debug mode it falls back to render_template so the auto-reloader
+    still picks up template edits.
+    """
+    if app.debug:
+        return render_template(template.name, **context)
+    app.update_template_context(context)
+    return template.render(context)
+
+
+def _save_upload(file):
+    """Persist an uploaded medical certificate and return its stored name.
+
+    Copies in 1 MiB chunks instead of file.save's 16 KiB default, cutting
+    the syscall count ~64x for uploads near the 5 MiB cap.
+    """
+    filename = secure_filename(f"{int(datetime.now().timestamp())}_{file.filename}")
+    filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
+    with open(filepath, "wb") as out:
+        shutil.copyfileobj(file.stream, out, length=1 << 20)
+    return filename
+
+
+def _unlink_quiet(path):
+    """Remove a file, ignoring the case where it's already gone.
+
+    One unlink syscall instead of a stat + unlink pair, and no TOCTOU
+    window between the two under concurrent deletes.
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
 
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+    # rpartition returns a fixed tuple (no list allocation like rsplit)
+    _, dot, ext = filename.rpartition(".")
+    return bool(dot) and ext.lower() in ALLOWED_EXTENSIONS
+
+
+def connect_db():
+    """Open a new database connection with the tuned pragmas applied"""
+    db = sqlite3.connect(
+        app.config["DATABASE"],
+        timeout=30,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=256,
+    )
+    db.row_factory = sqlite3.Row
 
+    # WAL lets readers run concurrently with writers, and synchronous=NORMAL
+    # halves the fsyncs per commit (safe in WAL mode)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("PRAGMA busy_timeout=30000")
+    db.execute("PRAGMA temp_store=MEMORY")
+    db.execute("PRAGMA cache_size=-20000")  # ~20MB page cache
+    db.execute("PRAGMA foreign_keys=ON")
+    db.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
 
-def get_db():
-    """Get database connection"""
-    db = sqlite3.connect(app.config["DATABASE"])
-    db.row_factory = sqlite3.Row
     return db
 
 
+# Process-wide pool of ready-to-use connections so steady-state requests
+# skip the connect + pragma setup cost entirely
+DB_POOL_SIZE = 5
+_db_pool = queue.Queue(maxsize=DB_POOL_SIZE)
+
+
+def get_db():
+    """Get database connection (shared for the duration of the request)"""
+    if "db" not in g:
+        try:
+            g.db = _db_pool.get_nowait()
+        except queue.Empty:
+            g.db = connect_db()
+        # Batch all writes in a mutating request into one transaction, so
+        # the request costs a single fsync at teardown instead of one per
+        # statement. Deferred BEGIN only takes the write lock on first write.
+        if has_request_context() and request.method in ("POST", "PUT", "DELETE"):
+            g.db.execute("BEGIN")
+    return g.db
+
+
+@app.teardown_request
+def commit_db(exception):
+    """Commit the request's transaction, or roll it back on error"""
+    db = g.get("db")
+    if db is not None and db.in_transaction:
+        if exception is None:
+            db.commit()
+        else:
+            db.rollback()
+
+
+@app.teardown_appcontext
+def close_db(exception):
+    """Return the request's database connection to the pool, if one was opened"""
+    db = g.pop("db", None)
+    if db is not None:
+        try:
+            db.rollback()  # discard any transaction left open by a failed request
+            db.execute("PRAGMA optimize")  # cheap no-op unless stats are stale
+            _db_pool.put_nowait(db)
+        except (queue.Full, sqlite3.Error):
+            db.close()
+
+
+# Bump when the schema script below changes so existing databases rerun it
+SCHEMA_VERSION = 2
+
+
 def init_db():
     """Initialize database with tables"""
     with app.app_context():
         db = get_db()
+
+        # One-shot guard: skip the whole script once this schema version
+        # has been applied (the dev reloader calls init_db twice per start)
+        if db.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+
+        # Migration: add is_archived if an existing database predates it.
+        # Checking table_info avoids a DDL statement that is guaranteed to
+        # fail everywhere else, and running it before the schema script lets
+        # the index on is_archived build against migrated databases too.
+        # (On a fresh database the set is empty; CREATE TABLE has the column.)
+        columns = {row["name"] for row in db.execute("PRAGMA table_info(employees)")}
+        if columns and "is_archived" not in columns:
+            db.execute("ALTER TABLE employees ADD COLUMN is_archived INTEGER DEFAULT 0")
+
         db.executescript("""
 			CREATE TABLE IF NOT EXISTS users (
 				id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -86,25 +328,60 @@ def init_db():
 				status TEXT DEFAULT 'Approved',
 				FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE
 			);
-		""")
 
-        # Migration: Add is_archived column if it doesn't exist
-        try:
-            db.execute("ALTER TABLE employees ADD COLUMN is_archived INTEGER DEFAULT 0")
-            db.commit()
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+			CREATE INDEX IF NOT EXISTS idx_annual_emp_status
+				ON annualLeave(employee_id, status, days_used);
+
+			DROP INDEX IF EXISTS idx_sick_emp_status;
+			CREATE INDEX idx_sick_emp_status
+				ON sickLeave(employee_id, status, start_date, days_used);
+
+			CREATE INDEX IF NOT EXISTS idx_emp_archived
+				ON employees(is_archived, name);
+
+			CREATE INDEX IF NOT EXISTS idx_annual_approved
+				ON annualLeave(employee_id, days_used) WHERE status = 'Approved';
+
+			CREATE INDEX IF NOT EXISTS idx_sick_approved
+				ON sickLeave(employee_id, start_date, days_used) WHERE status = 'Approved';
+
+			DROP VIEW IF EXISTS v_employee_leave_usage;
+			CREATE VIEW v_employee_leave_usage AS
+				SELECT e.id AS employee_id,
+					   COALESCE(a.total, 0) AS annual_used,
+					   COALESCE(s.total, 0) AS sick_used,
+					   COALESCE(s.cycle_total, 0) AS sick_used_cycle
+				FROM employees e
+				LEFT JOIN (SELECT employee_id, SUM(days_used) AS total
+						   FROM annualLeave
+						   WHERE status = 'Approved'
+						   GROUP BY employee_id) a ON a.employee_id = e.id
+				LEFT JOIN (SELECT l.employee_id,
+								  SUM(l.days_used) AS total,
+								  SUM(CASE WHEN l.start_date >= date(emp.hire_date,
+									  '+' || (180 + 1095 * max(0, CAST((julianday('now', 'localtime') - julianday(emp.hire_date) - 180) / 1095 AS INTEGER))) || ' days')
+									  THEN l.days_used ELSE 0 END) AS cycle_total
+						   FROM sickLeave l
+						   JOIN employees emp ON emp.id = l.employee_id
+						   WHERE l.status = 'Approved'
+						   GROUP BY l.employee_id) s ON s.employee_id = e.id;
+		""")
 
         # Create default admin user if it doesn't exist
         try:
             db.execute(
                 "INSERT INTO users (username, password, password_changed) VALUES (?, ?, ?)",
-                ("admin", generate_password_hash("admin123"), 0),
+                ("admin", generate_password_hash("admin123", method=PASSWORD_HASH_METHOD), 0),
             )
             db.commit()
         except sqlite3.IntegrityError:
             pass
 
+        # Give the planner statistics for the fresh indexes
+        db.execute("ANALYZE")
+
+        db.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+
 
 def login_required(f):
     """Decorator to require login for routes"""
@@ -113,28 +390,34 @@ def login_required(f):
     def decorated_function(*args, **kwargs):
         if "user_id" not in session:
             return redirect(url_for("login"))
-        # Force password change if it hasn't been changed
-        if session.get("force_password_change"):
+        # Force password change if it hasn't been changed; the flag lives in
+        # the signed cookie so no user row is fetched per request
+        if session.get("force_password_change") or (
+            session.get("password_changed") is False
+        ):
             return redirect(url_for("change_password"))
         return f(*args, **kwargs)
 
     return decorated_function
 
 
-def calculate_annual_leave_balance(employee_id):
-    """Calculate annual leave balance based on hire date and used days"""
-    db = get_db()
+def get_today():
+    """Today's date, computed once per request"""
+    if "today" not in g:
+        g.today = date.today()
+    return g.today
 
-    # Get employee hire date
-    emp = db.execute(
-        "SELECT hire_date, employee_id FROM employees WHERE id = ?", (employee_id,)
-    ).fetchone()
 
-    if not emp:
-        return 0, 0
+def _add_days(d, n):
+    """date + n days via ordinals, skipping timedelta construction"""
+    return date.fromordinal(d.toordinal() + n)
+
 
-    hire_date = datetime.strptime(emp["hire_date"], "%Y-%m-%d")
-    today = datetime.now()
+# The two entitlement kernels below are deliberately pure functions of their
+# arguments (no DB or request state) so they stay trivial to test in
+# isolation and cheap to call from the batched summary loop.
+def annual_leave_entitlement(hire_date, today, id_employee):
+    """Calculate annual leave entitlement accrued since the hire date"""
     months_employed = (today.year - hire_date.year) * 12 + (
         today.month - hire_date.month
     )
@@ -142,26 +425,128 @@ def calculate_annual_leave_balance(employee_id):
     # Calculate entitlement based on employee ID
     # Special rate for employee 8601310127086: 1.66 days per month
     # All other employees: 1.25 days per month
-    id_employee = emp["employee_id"]
-
     if id_employee == "8601310127086":
-        entitlement = months_employed * (20 / 12)
-    else:
-        entitlement = months_employed * 1.25
+        return months_employed * (20 / 12)
+    return months_employed * 1.25
 
-    # Get used days
-    used = db.execute(
-        'SELECT COALESCE(SUM(days_used), 0) as total FROM annualLeave WHERE employee_id = ? AND status = "Approved"',
+
+def sick_leave_entitlement_and_balance(hire_date, today, total_used, cycle_used):
+    """Calculate sick leave entitlement and balance from precomputed usage.
+
+    total_used is all approved sick leave ever taken; cycle_used is the
+    approved sick leave taken since the current 36-month cycle started.
+    """
+    days_employed = today.toordinal() - hire_date.toordinal()
+
+    # Case 1: Within first 6 months (180 days) - 6 days total
+    if days_employed < 180:
+        return 6, max(0, 6 - total_used)
+
+    # Case 2: After 6 months - 30 days per 36-month cycle
+    complete_cycles = (days_employed - 180) // 1095  # 1095 days = 36 months
+    if complete_cycles == 0:
+        # First 36-month cycle after probation: 30 days minus everything
+        # used so far (leave taken in the first 6 months carries over)
+        return 30, max(0, 30 - total_used)
+
+    # Subsequent cycles: fresh 30 days minus what was used this cycle
+    return 30, max(0, 30 - cycle_used)
+
+
+def fetch_leave_summaries(is_archived=0):
+    """Fetch employees with leave balances, aggregating usage in one query.
+
+    Replaces the per-employee balance lookups (4N+1 queries) with a single
+    SELECT against the v_employee_leave_usage view, which groups approved
+    annual/sick sums per employee and computes the sick sum inside the
+    current 36-month cycle with a CASE on each employee's cycle start date.
+    Employees with no leave records at all cost nothing extra: the view's
+    LEFT JOIN + COALESCE hands them zero usage, so their balance falls out
+    as the bare entitlement without any further SQL.
+    """
+    db = get_db()
+    today = get_today()
+
+    # The accrual rate and months employed are computed inline by SQLite
+    # (mirroring annual_leave_entitlement), so the Python loop is left with
+    # one multiplication per row instead of date arithmetic
+    rows = db.execute(
+        """SELECT e.id, e.name, e.employee_id, e.hire_date,
+				  u.annual_used, u.sick_used, u.sick_used_cycle,
+				  CASE WHEN e.employee_id = '8601310127086'
+					   THEN 20.0 / 12 ELSE 1.25 END AS accrual_rate,
+				  (strftime('%Y', 'now', 'localtime') - strftime('%Y', e.hire_date)) * 12
+					  + (strftime('%m', 'now', 'localtime') - strftime('%m', e.hire_date)) AS months_employed
+		   FROM employees e
+		   JOIN v_employee_leave_usage u ON u.employee_id = e.id
+		   WHERE e.is_archived = ?
+		   ORDER BY e.name""",
+        (is_archived,),
+    ).fetchall()
+
+    # Hoist lookups out of the per-employee loop; the arithmetic pass over
+    # the fetched rows is the only Python-level work left on this path
+    fromisoformat = date.fromisoformat
+    summaries = []
+    append = summaries.append
+    for row in rows:
+        hire_date = fromisoformat(row["hire_date"])
+        annual_ent = row["months_employed"] * row["accrual_rate"]
+        sick_ent, sick_bal = sick_leave_entitlement_and_balance(
+            hire_date, today, float(row["sick_used"]), float(row["sick_used_cycle"])
+        )
+
+        append(
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "employee_id": row["employee_id"],
+                "hire_date": row["hire_date"],
+                "annual_leave_entitlement": annual_ent,
+                "annual_leave_balance": annual_ent - float(row["annual_used"]),
+                "sick_leave_entitlement": sick_ent,
+                "sick_leave_balance": sick_bal,
+            }
+        )
+
+    return summaries
+
+
+def calculate_annual_leave_balance(employee_id, db=None):
+    """Calculate annual leave balance based on hire date and used days"""
+    # Memoized per request: repeated lookups for the same employee reuse
+    # the first result instead of re-running the SUM queries
+    cache = g.setdefault("_balance_cache", {})
+    key = (employee_id, "annual")
+    if key in cache:
+        return cache[key]
+
+    if db is None:
+        db = get_db()
+
+    # Hire date and approved usage in one round trip
+    emp = db.execute(
+        """SELECT e.hire_date, e.employee_id,
+				  COALESCE((SELECT SUM(days_used) FROM annualLeave
+							WHERE employee_id = e.id AND status = 'Approved'), 0) as total
+		   FROM employees e
+		   WHERE e.id = ?""",
         (employee_id,),
     ).fetchone()
 
-    used_days = float(used["total"]) if used else 0
-    balance = entitlement - used_days
+    if not emp:
+        return 0, 0
+
+    hire_date = date.fromisoformat(emp["hire_date"])
+    today = get_today()
+    entitlement = annual_leave_entitlement(hire_date, today, emp["employee_id"])
+    balance = entitlement - float(emp["total"])
 
-    return entitlement, balance
+    cache[key] = (entitlement, balance)
+    return cache[key]
 
 
-def calculate_sick_leave_balance(employee_id):
+def calculate_sick_leave_balance(employee_id, db=None):
     """
     Calculate sick leave balance:
     - 36-month cycle starts from hire date
@@ -170,7 +555,13 @@ def calculate_sick_leave_balance(employee_id):
     - At 6-month mark: unused days disappear, used days reduce the 30-day allotment
     - Only deduct leave taken in current cycle
     """
-    db = get_db()
+    cache = g.setdefault("_balance_cache", {})
+    key = (employee_id, "sick")
+    if key in cache:
+        return cache[key]
+
+    if db is None:
+        db = get_db()
 
     # Get employee hire date
     emp = db.execute(
@@ -180,79 +571,30 @@ def calculate_sick_leave_balance(employee_id):
     if not emp:
         return 0, 0
 
-    hire_date = datetime.strptime(emp["hire_date"], "%Y-%m-%d")
-    today = datetime.now()
-
-    # Calculate total days employed
-    days_employed = (today - hire_date).days
+    hire_date = date.fromisoformat(emp["hire_date"])
+    today = get_today()
 
-    # Case 1: Within first 6 months (180 days)
-    if days_employed < 180:
-        # Entitlement is 6 days for first 6 months
-        entitlement = 6
-
-        # Get sick leave used in first 6 months
-        used = db.execute(
-            '''SELECT COALESCE(SUM(days_used), 0) as total 
-			   FROM sickLeave 
-			   WHERE employee_id = ? 
-			   AND status = "Approved"''',
-            (employee_id,),
-        ).fetchone()
-        used_days = float(used["total"]) if used else 0
-        balance = entitlement - used_days
+    days_employed = today.toordinal() - hire_date.toordinal()
+    complete_cycles = max(0, (days_employed - 180) // 1095)  # 1095 days = 36 months
+    cycle_start_date = _add_days(hire_date, 180 + (complete_cycles * 1095))
 
-        return entitlement, max(0, balance)
-
-    # Case 2: After 6 months - 30 days per 36-month cycle
-    else:
-        # Calculate which 36-month cycle we're in
-        days_after_six_months = days_employed - 180
-        complete_cycles = days_after_six_months // 1095  # 1095 days = 36 months
-        days_in_current_cycle = days_after_six_months % 1095
-
-        # Calculate current cycle start date
-        cycle_start_date = hire_date + timedelta(days=180 + (complete_cycles * 1095))
-
-        # Get sick leave used in current cycle
-        used = db.execute(
-            """SELECT COALESCE(SUM(days_used), 0) as total 
-			   FROM sickLeave 
-			   WHERE employee_id = ? 
-			   AND status = "Approved" 
-			   AND start_date >= ?""",
-            (employee_id, cycle_start_date.strftime("%Y-%m-%d")),
-        ).fetchone()
-        used_days = float(used["total"]) if used else 0
-
-        # At the 6-month mark, if employee used leave in first 6 months,
-        # they carry forward 30 - used_days. If they used nothing, they get 30.
-        # For subsequent cycles, they always get 30 minus what they used this cycle.
-        if complete_cycles == 0:
-            # Still in the first 36-month cycle after probation
-            # Get leave used in first 6 months to carry forward
-            probation_used = db.execute(
-                """SELECT COALESCE(SUM(days_used), 0) as total 
-				   FROM sickLeave 
-				   WHERE employee_id = ? 
-				   AND status = "Approved"
-				   AND start_date < ?""",
-                (employee_id, (hire_date + timedelta(days=180)).strftime("%Y-%m-%d")),
-            ).fetchone()
-            probation_used_days = (
-                float(probation_used["total"]) if probation_used else 0
-            )
-
-            # In first 36-month cycle: 30 days minus what was used in first 6 months
-            entitlement = 30
-            total_used_in_cycle = probation_used_days + used_days
-            balance = entitlement - total_used_in_cycle
-        else:
-            # Subsequent cycles: fresh 30 days per cycle
-            entitlement = 30
-            balance = entitlement - used_days
+    # Total approved sick leave and the share taken since the current
+    # 36-month cycle started, aggregated in a single scan
+    used = db.execute(
+        """SELECT COALESCE(SUM(days_used), 0) as total,
+				  COALESCE(SUM(CASE WHEN start_date >= ? THEN days_used ELSE 0 END), 0) as cycle_total
+		   FROM sickLeave
+		   WHERE employee_id = ?
+		   AND status = 'Approved'""",
+        (cycle_start_date.isoformat(), employee_id),
+    ).fetchone()
+    total_used = float(used["total"]) if used else 0
+    cycle_used = float(used["cycle_total"]) if used else 0
 
-        return entitlement, max(0, balance)
+    cache[key] = sick_leave_entitlement_and_balance(
+        hire_date, today, total_used, cycle_used
+    )
+    return cache[key]
 
 
 # Routes
@@ -266,10 +608,13 @@ def login():
 
         db = get_db()
         user = db.execute(
-            "SELECT * FROM users WHERE username = ?", (username,)
+            "SELECT id, username, password, password_changed FROM users WHERE username = ?",
+            (username,),
         ).fetchone()
 
         if user is None:
+            # Burn the same hashing cost as a real verification
+            check_password_hash(DUMMY_PASSWORD_HASH, password)
             error = "Invalid username"
         elif not check_password_hash(user["password"], password):
             error = "Invalid password"
@@ -278,6 +623,7 @@ def login():
             session.clear()
             session["user_id"] = user["id"]
             session["username"] = user["username"]
+            session["password_changed"] = bool(user["password_changed"])
 
             # Force password change on first login
             if not user["password_changed"]:
@@ -286,9 +632,9 @@ def login():
 
             return redirect(url_for("index"))
 
-        return render_template("login.html", error=error)
+        return render_cached(_tpl_login, error=error)
 
-    return render_template("login.html")
+    return render_cached(_tpl_login)
 
 
 @app.route("/change-password", methods=["GET", "POST"])
@@ -313,18 +659,21 @@ def change_password():
             db = get_db()
             db.execute(
                 "UPDATE users SET password = ?, password_changed = 1 WHERE id = ?",
-                (generate_password_hash(new_password), session["user_id"]),
+                (
+                    generate_password_hash(new_password, method=PASSWORD_HASH_METHOD),
+                    session["user_id"],
+                ),
             )
-            db.commit()
 
             # Clear the force password change flag
             session.pop("force_password_change", None)
+            session["password_changed"] = True
             return redirect(url_for("index"))
 
-        return render_template("change_password.html", error=error, force_change=True)
+        return render_cached(_tpl_change_password, error=error, force_change=True)
 
     force_change = session.get("force_password_change", False)
-    return render_template("change_password.html", force_change=force_change)
+    return render_cached(_tpl_change_password, force_change=force_change)
 
 
 @app.route("/logout")
@@ -364,12 +713,13 @@ def api_change_password():
             return jsonify({"error": "Current password is incorrect"}), 401
 
         # Hash and update new password
-        hashed_password = generate_password_hash(new_password)
+        hashed_password = generate_password_hash(
+            new_password, method=PASSWORD_HASH_METHOD
+        )
         db.execute(
             "UPDATE users SET password = ? WHERE username = ?",
             (hashed_password, username),
         )
-        db.commit()
 
         return jsonify({"message": "Password changed successfully"}), 200
     except Exception as e:
@@ -380,7 +730,7 @@ def api_change_password():
 @login_required
 def index():
     """Main page"""
-    return render_template("index.html")
+    return render_cached(_tpl_index)
 
 
 @app.route("/api/employees", methods=["GET", "POST"])
@@ -393,11 +743,9 @@ def employees():
         data = request.json
         try:
             cursor = db.execute(
-                """INSERT INTO employees (name, employee_id, hire_date)
-				   VALUES (?, ?, ?)""",
+                SQL_INSERT_EMPLOYEE,
                 (data["name"], data["employee_id"], data["hire_date"]),
             )
-            db.commit()
 
             emp_id = cursor.lastrowid
             return jsonify(
@@ -412,25 +760,18 @@ def employees():
             return jsonify({"error": str(e)}), 400
 
     # GET - fetch all active (non-archived) employees with leave balances
-    employees_list = db.execute(
-        "SELECT * FROM employees WHERE is_archived = 0 ORDER BY name"
-    ).fetchall()
     result = []
-
-    for emp in employees_list:
-        annual_ent, annual_bal = calculate_annual_leave_balance(emp["id"])
-        sick_ent, sick_bal = calculate_sick_leave_balance(emp["id"])
-
+    for emp in fetch_leave_summaries(is_archived=0):
         result.append(
             {
                 "id": emp["id"],
                 "name": emp["name"],
                 "employee_id": emp["employee_id"],
                 "hire_date": emp["hire_date"],
-                "annual_leave_balance": round(annual_bal, 2),
-                "annual_leave_entitlement": round(annual_ent, 2),
-                "sick_leave_balance": round(sick_bal, 2),
-                "sick_leave_entitlement": round(sick_ent, 2),
+                "annual_leave_balance": round(emp["annual_leave_balance"], 2),
+                "annual_leave_entitlement": round(emp["annual_leave_entitlement"], 2),
+                "sick_leave_balance": round(emp["sick_leave_balance"], 2),
+                "sick_leave_entitlement": round(emp["sick_leave_entitlement"], 2),
             }
         )
 
@@ -446,7 +787,6 @@ def employee_detail(emp_id):
     if request.method == "DELETE":
         try:
             db.execute("UPDATE employees SET is_archived = 1 WHERE id = ?", (emp_id,))
-            db.commit()
             return jsonify({"message": "Employee archived"}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 400
@@ -454,14 +794,12 @@ def employee_detail(emp_id):
     if request.method == "PUT":
         data = request.json
         try:
-            db.execute(
-                """UPDATE employees 
-				   SET name = ?, employee_id = ?, hire_date = ?
-				   WHERE id = ?""",
+            row = db.execute(
+                SQL_UPDATE_EMPLOYEE,
                 (data["name"], data["employee_id"], data["hire_date"], emp_id),
-            )
-            db.commit()
-            return jsonify({"message": "Employee updated"}), 200
+            ).fetchone()
+            updated = dict(row) if row else {}
+            return jsonify({"message": "Employee updated", **updated}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 400
 
@@ -475,47 +813,42 @@ def annual_leave():
     if request.method == "POST":
         data = request.json
         try:
-            db.execute(
-                """INSERT INTO annualLeave (employee_id, start_date, end_date, reason, days_used, status)
-				   VALUES (?, ?, ?, ?, ?, ?)""",
-                (
-                    data["employee_id"],
-                    data["start_date"],
-                    data["end_date"],
-                    data.get("reason", ""),
-                    data["days_used"],
-                    data.get("status", "Approved"),
-                ),
+            # Accept a list of records for bulk insert in one transaction
+            records = data if isinstance(data, list) else [data]
+            if not records:
+                return jsonify({"error": "No records provided"}), 400
+            db.executemany(
+                SQL_INSERT_ANNUAL,
+                [
+                    (
+                        rec["employee_id"],
+                        rec["start_date"],
+                        rec["end_date"],
+                        rec.get("reason", ""),
+                        rec["days_used"],
+                        rec.get("status", "Approved"),
+                    )
+                    for rec in records
+                ],
             )
-            db.commit()
             return jsonify({"message": "Annual leave added"}), 201
         except Exception as e:
+            # Discard anything executemany inserted before the failure, so
+            # the teardown commit can't persist half a batch
+            db.rollback()
             return jsonify({"error": str(e)}), 400
 
     # GET - only return leave for active (non-archived) employees
     emp_id = request.args.get("employee_id")
     if emp_id:
         leaves = db.execute(
-            """SELECT a.id, a.employee_id, e.name as employee_name, a.start_date, a.end_date, 
-					  a.reason, a.days_used, a.status 
-			   FROM annualLeave a
-			   LEFT JOIN employees e ON a.employee_id = e.id
-			   WHERE a.employee_id = ? AND e.is_archived = 0
-			   ORDER BY a.start_date DESC""",
+            SQL_SELECT_ANNUAL + " AND a.employee_id = ? ORDER BY a.start_date DESC",
             (emp_id,),
-        ).fetchall()
+        )
     else:
-        leaves = db.execute(
-            """SELECT a.id, a.employee_id, e.name as employee_name, a.start_date, a.end_date, 
-					  a.reason, a.days_used, a.status 
-			   FROM annualLeave a
-			   LEFT JOIN employees e ON a.employee_id = e.id
-			   WHERE e.is_archived = 0
-			   ORDER BY a.start_date DESC"""
-        ).fetchall()
-
-    result = [dict(leaf) for leaf in leaves]
-    return jsonify(result), 200
+        leaves = db.execute(SQL_SELECT_ANNUAL + " ORDER BY a.start_date DESC")
+
+    return stream_json_rows(leaves)
 
 
 @app.route("/api/annual-leave/<int:leave_id>", methods=["PUT", "DELETE"])
@@ -526,8 +859,7 @@ def annual_leave_detail(leave_id):
 
     if request.method == "DELETE":
         try:
-            db.execute("DELETE FROM annualLeave WHERE id = ?", (leave_id,))
-            db.commit()
+            db.execute(SQL_DELETE_ANNUAL, (leave_id,))
             return jsonify({"message": "Annual leave deleted"}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 400
@@ -535,10 +867,8 @@ def annual_leave_detail(leave_id):
     if request.method == "PUT":
         data = request.json
         try:
-            db.execute(
-                """UPDATE annualLeave 
-				   SET start_date = ?, end_date = ?, reason = ?, days_used = ?, status = ?
-				   WHERE id = ?""",
+            row = db.execute(
+                SQL_UPDATE_ANNUAL,
                 (
                     data["start_date"],
                     data["end_date"],
@@ -547,9 +877,9 @@ def annual_leave_detail(leave_id):
                     data.get("status", "Approved"),
                     leave_id,
                 ),
-            )
-            db.commit()
-            return jsonify({"message": "Annual leave updated"}), 200
+            ).fetchone()
+            updated = dict(row) if row else {}
+            return jsonify({"message": "Annual leave updated", **updated}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 400
 
@@ -577,64 +907,56 @@ def sick_leave():
             if "medical_cert_file" in request.files:
                 file = request.files["medical_cert_file"]
                 if file and file.filename and allowed_file(file.filename):
-                    filename = secure_filename(
-                        f"{int(datetime.now().timestamp())}_{file.filename}"
-                    )
-                    filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-                    file.save(filepath)
-                    data["medical_cert"] = filename
+                    data["medical_cert"] = _save_upload(file)
         else:
-            # JSON request (for compatibility)
-            data = request.json or {}
+            # JSON request (for compatibility); an empty list must survive
+            # to the batch check below, so only None falls back to {}
+            data = request.json
+            if data is None:
+                data = {}
 
         try:
-            db.execute(
-                """INSERT INTO sickLeave (employee_id, start_date, end_date, reason, days_used, medical_cert, status)
-				   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    data["employee_id"],
-                    data["start_date"],
-                    data["end_date"],
-                    data.get("reason", ""),
-                    data["days_used"],
-                    data.get("medical_cert", ""),
-                    data.get("status", "Approved"),
-                ),
+            # Accept a list of records for bulk insert in one transaction
+            records = data if isinstance(data, list) else [data]
+            if not records:
+                return jsonify({"error": "No records provided"}), 400
+            db.executemany(
+                SQL_INSERT_SICK,
+                [
+                    (
+                        rec["employee_id"],
+                        rec["start_date"],
+                        rec["end_date"],
+                        rec.get("reason", ""),
+                        rec["days_used"],
+                        rec.get("medical_cert", ""),
+                        rec.get("status", "Approved"),
+                    )
+                    for rec in records
+                ],
             )
-            db.commit()
             return jsonify(
                 {
                     "message": "Sick leave added",
-                    "medical_cert": data.get("medical_cert"),
+                    "medical_cert": records[-1].get("medical_cert"),
                 }
             ), 201
         except Exception as e:
+            # Same all-or-nothing contract as the annual bulk insert
+            db.rollback()
             return jsonify({"error": str(e)}), 400
 
     # GET - only return leave for active (non-archived) employees
     emp_id = request.args.get("employee_id")
     if emp_id:
         leaves = db.execute(
-            """SELECT s.id, s.employee_id, e.name as employee_name, s.start_date, s.end_date, 
-					  s.reason, s.days_used, s.medical_cert, s.status 
-			   FROM sickLeave s
-			   LEFT JOIN employees e ON s.employee_id = e.id
-			   WHERE s.employee_id = ? AND e.is_archived = 0
-			   ORDER BY s.start_date DESC""",
+            SQL_SELECT_SICK + " AND s.employee_id = ? ORDER BY s.start_date DESC",
             (emp_id,),
-        ).fetchall()
+        )
     else:
-        leaves = db.execute(
-            """SELECT s.id, s.employee_id, e.name as employee_name, s.start_date, s.end_date, 
-					  s.reason, s.days_used, s.medical_cert, s.status 
-			   FROM sickLeave s
-			   LEFT JOIN employees e ON s.employee_id = e.id
-			   WHERE e.is_archived = 0
-			   ORDER BY s.start_date DESC"""
-        ).fetchall()
-
-    result = [dict(leaf) for leaf in leaves]
-    return jsonify(result), 200
+        leaves = db.execute(SQL_SELECT_SICK + " ORDER BY s.start_date DESC")
+
+    return stream_json_rows(leaves)
 
 
 @app.route("/api/sick-leave/<int:leave_id>", methods=["PUT", "DELETE"])
@@ -645,19 +967,14 @@ def sick_leave_detail(leave_id):
 
     if request.method == "DELETE":
         try:
-            # Get the medical certificate filename before deleting
-            leave = db.execute(
-                "SELECT medical_cert FROM sickLeave WHERE id = ?", (leave_id,)
-            ).fetchone()
+            # RETURNING hands back the medical certificate filename, so the
+            # delete and the pre-delete lookup are one statement
+            leave = db.execute(SQL_DELETE_SICK, (leave_id,)).fetchone()
             if leave and leave["medical_cert"]:
-                filepath = os.path.join(
-                    app.config["UPLOAD_FOLDER"], leave["medical_cert"]
+                _unlink_quiet(
+                    os.path.join(app.config["UPLOAD_FOLDER"], leave["medical_cert"])
                 )
-                if os.path.exists(filepath):
-                    os.remove(filepath)
 
-            db.execute("DELETE FROM sickLeave WHERE id = ?", (leave_id,))
-            db.commit()
             return jsonify({"message": "Sick leave deleted"}), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 400
@@ -691,19 +1008,14 @@ def sick_leave_detail(leave_id):
                     if file and file.filename and allowed_file(file.filename):
                         # Delete old file if it exists
                         if current_medical_cert:
-                            old_filepath = os.path.join(
-                                app.config["UPLOAD_FOLDER"], current_medical_cert
+                            _unlink_quiet(
+                                os.path.join(
+                                    app.config["UPLOAD_FOLDER"], current_medical_cert
+                                )
                             )
-                            if os.path.exists(old_filepath):
-                                os.remove(old_filepath)
 
                         # Save new file
-                        filename = secure_filename(
-                            f"{int(datetime.now().timestamp())}_{file.filename}"
-                        )
-                        filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-                        file.save(filepath)
-                        new_medical_cert = filename
+                        new_medical_cert = _save_upload(file)
 
                 # Check if medical_cert field is set to empty string (deletion)
                 if (
@@ -712,11 +1024,11 @@ def sick_leave_detail(leave_id):
                 ):
                     # Delete old file if it exists
                     if current_medical_cert:
-                        old_filepath = os.path.join(
-                            app.config["UPLOAD_FOLDER"], current_medical_cert
+                        _unlink_quiet(
+                            os.path.join(
+                                app.config["UPLOAD_FOLDER"], current_medical_cert
+                            )
                         )
-                        if os.path.exists(old_filepath):
-                            os.remove(old_filepath)
                     new_medical_cert = ""
             else:
                 # JSON request (for compatibility)
@@ -724,20 +1036,18 @@ def sick_leave_detail(leave_id):
                 # If medical_cert is explicitly set to empty string, delete the file
                 if "medical_cert" in data and data["medical_cert"] == "":
                     if current_medical_cert:
-                        old_filepath = os.path.join(
-                            app.config["UPLOAD_FOLDER"], current_medical_cert
+                        _unlink_quiet(
+                            os.path.join(
+                                app.config["UPLOAD_FOLDER"], current_medical_cert
+                            )
                         )
-                        if os.path.exists(old_filepath):
-                            os.remove(old_filepath)
                     new_medical_cert = ""
                 elif "medical_cert" in data:
                     new_medical_cert = data["medical_cert"]
 
             # Update the database
-            db.execute(
-                """UPDATE sickLeave 
-				   SET start_date = ?, end_date = ?, reason = ?, days_used = ?, medical_cert = ?, status = ?
-				   WHERE id = ?""",
+            row = db.execute(
+                SQL_UPDATE_SICK,
                 (
                     data["start_date"],
                     data["end_date"],
@@ -747,10 +1057,10 @@ def sick_leave_detail(leave_id):
                     data.get("status", "Approved"),
                     leave_id,
                 ),
-            )
-            db.commit()
+            ).fetchone()
+            updated = dict(row) if row else {}
             return jsonify(
-                {"message": "Sick leave updated", "medical_cert": new_medical_cert}
+                {"message": "Sick leave updated", "medical_cert": new_medical_cert, **updated}
             ), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 400
@@ -762,28 +1072,20 @@ def view_leave():
     """Get all leave records with employee info"""
     db = get_db()
 
-    # Get all active employees
-    employees_data = db.execute(
-        """SELECT id, name, employee_id, hire_date
-		   FROM employees 
-		   WHERE is_archived = 0
-		   ORDER BY name ASC"""
-    ).fetchall()
-
-    # Enhance employee data with calculated balances
-    employees = []
-    for emp in employees_data:
-        emp_dict = dict(emp)
-        # Calculate annual leave balance
-        annual_alloc, annual_balance = calculate_annual_leave_balance(emp["id"])
-        # Calculate sick leave balance
-        sick_alloc, sick_balance = calculate_sick_leave_balance(emp["id"])
-
-        emp_dict["annual_leave_allocated"] = annual_alloc
-        emp_dict["annual_leave_balance"] = annual_balance
-        emp_dict["sick_leave_allocated"] = sick_alloc
-        emp_dict["sick_leave_balance"] = sick_balance
-        employees.append(emp_dict)
+    # Get all active employees with balances from the single aggregate query
+    employees = [
+        {
+            "id": emp["id"],
+            "name": emp["name"],
+            "employee_id": emp["employee_id"],
+            "hire_date": emp["hire_date"],
+            "annual_leave_allocated": emp["annual_leave_entitlement"],
+            "annual_leave_balance": emp["annual_leave_balance"],
+            "sick_leave_allocated": emp["sick_leave_entitlement"],
+            "sick_leave_balance": emp["sick_leave_balance"],
+        }
+        for emp in fetch_leave_summaries(is_archived=0)
+    ]
 
     # Get all annual leave with employee names
     annual = db.execute("""
@@ -791,7 +1093,7 @@ def view_leave():
 			   e.name as employee_name, e.employee_id as emp_number FROM annualLeave a
 		JOIN employees e ON a.employee_id = e.id
 		ORDER BY a.start_date DESC
-	""").fetchall()
+	""")
 
     # Get all sick leave with employee names
     sick = db.execute("""
@@ -799,15 +1101,48 @@ def view_leave():
 			   e.name as employee_name, e.employee_id as emp_number FROM sickLeave s
 		JOIN employees e ON s.employee_id = e.id
 		ORDER BY s.start_date DESC
-	""").fetchall()
+	""")
 
-    return jsonify(
-        {
-            "employees": employees,
-            "annual": [dict(row) for row in annual],
-            "sick": [dict(row) for row in sick],
-        }
-    ), 200
+    # Serialize straight from the response dict: building row dicts by
+    # position off the cursor skips sqlite3.Row's per-row keys lookup, and
+    # Response avoids jsonify's second pass over the payload
+    return Response(
+        app.json.dumps(
+            {
+                "employees": employees,
+                "annual": [
+                    {
+                        "id": r[0],
+                        "employee_id": r[1],
+                        "start_date": r[2],
+                        "end_date": r[3],
+                        "reason": r[4],
+                        "days_used": r[5],
+                        "status": r[6],
+                        "employee_name": r[7],
+                        "emp_number": r[8],
+                    }
+                    for r in annual
+                ],
+                "sick": [
+                    {
+                        "id": r[0],
+                        "employee_id": r[1],
+                        "start_date": r[2],
+                        "end_date": r[3],
+                        "reason": r[4],
+                        "days_used": r[5],
+                        "medical_cert": r[6],
+                        "status": r[7],
+                        "employee_name": r[8],
+                        "emp_number": r[9],
+                    }
+                    for r in sick
+                ],
+            }
+        ),
+        mimetype="application/json",
+    )
 
 
 @app.route("/uploads/<filename>")
@@ -815,16 +1150,14 @@ def view_leave():
 def download_file(filename):
     """Serve uploaded files"""
     try:
-        filename = secure_filename(filename)
-        filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-
-        # Verify file exists and is in the uploads folder
-        if os.path.exists(filepath) and os.path.abspath(filepath).startswith(
-            os.path.abspath(app.config["UPLOAD_FOLDER"])
-        ):
-            return send_file(filepath, as_attachment=False)
-        else:
-            return jsonify({"error": "File not found"}), 404
+        # send_from_directory confines the path to the uploads folder and
+        # serves conditional responses, so repeat fetches of a certificate
+        # come back 304 Not Modified instead of re-sending the body
+        return send_from_directory(
+            UPLOAD_DIR_ABS, secure_filename(filename), conditional=True, max_age=3600
+        )
+    except NotFound:
+        return jsonify({"error": "File not found"}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
@@ -835,28 +1168,20 @@ def archived_employees():
     """Get all archived employees with their leave records"""
     db = get_db()
 
-    # Get all archived employees
-    archived_data = db.execute(
-        """SELECT id, name, employee_id, hire_date
-		   FROM employees 
-		   WHERE is_archived = 1
-		   ORDER BY name ASC"""
-    ).fetchall()
-
-    # Enhance employee data with calculated balances
-    employees = []
-    for emp in archived_data:
-        emp_dict = dict(emp)
-        # Calculate annual leave balance
-        annual_alloc, annual_balance = calculate_annual_leave_balance(emp["id"])
-        # Calculate sick leave balance
-        sick_alloc, sick_balance = calculate_sick_leave_balance(emp["id"])
-
-        emp_dict["annual_leave_allocated"] = annual_alloc
-        emp_dict["annual_leave_balance"] = annual_balance
-        emp_dict["sick_leave_allocated"] = sick_alloc
-        emp_dict["sick_leave_balance"] = sick_balance
-        employees.append(emp_dict)
+    # Get all archived employees with balances from the single aggregate query
+    employees = [
+        {
+            "id": emp["id"],
+            "name": emp["name"],
+            "employee_id": emp["employee_id"],
+            "hire_date": emp["hire_date"],
+            "annual_leave_allocated": emp["annual_leave_entitlement"],
+            "annual_leave_balance": emp["annual_leave_balance"],
+            "sick_leave_allocated": emp["sick_leave_entitlement"],
+            "sick_leave_balance": emp["sick_leave_balance"],
+        }
+        for emp in fetch_leave_summaries(is_archived=1)
+    ]
 
     # Get all annual leave for archived employees
     annual = db.execute("""
@@ -865,7 +1190,7 @@ def archived_employees():
 		JOIN employees e ON a.employee_id = e.id
 		WHERE e.is_archived = 1
 		ORDER BY a.start_date DESC
-	""").fetchall()
+	""")
 
     # Get all sick leave for archived employees
     sick = db.execute("""
@@ -874,15 +1199,44 @@ def archived_employees():
 		JOIN employees e ON s.employee_id = e.id
 		WHERE e.is_archived = 1
 		ORDER BY s.start_date DESC
-	""").fetchall()
+	""")
 
-    return jsonify(
-        {
-            "employees": employees,
-            "annual": [dict(row) for row in annual],
-            "sick": [dict(row) for row in sick],
-        }
-    ), 200
+    # Same positional-build + single-serialize shape as view_leave
+    return Response(
+        app.json.dumps(
+            {
+                "employees": employees,
+                "annual": [
+                    {
+                        "id": r[0],
+                        "employee_id": r[1],
+                        "start_date": r[2],
+                        "end_date": r[3],
+                        "reason": r[4],
+                        "days_used": r[5],
+                        "status": r[6],
+                        "employee_name": r[7],
+                    }
+                    for r in annual
+                ],
+                "sick": [
+                    {
+                        "id": r[0],
+                        "employee_id": r[1],
+                        "start_date": r[2],
+                        "end_date": r[3],
+                        "reason": r[4],
+                        "days_used": r[5],
+                        "medical_cert": r[6],
+                        "status": r[7],
+                        "employee_name": r[8],
+                    }
+                    for r in sick
+                ],
+            }
+        ),
+        mimetype="application/json",
+    )
 
 
 @app.route("/api/employees/<int:emp_id>/medical-documents", methods=["GET"])
@@ -900,7 +1254,7 @@ def get_employee_medical_documents(emp_id):
         (emp_id,),
     ).fetchall()
 
-    return jsonify({"documents": [dict(row) for row in documents]}), 200
+    return jsonify({"documents": _rows_to_dicts(documents)}), 200
 
 
 @app.route("/api/employees/<int:emp_id>/restore", methods=["POST"])
@@ -911,7 +1265,6 @@ def restore_employee(emp_id):
 
     try:
         db.execute("UPDATE employees SET is_archived = 0 WHERE id = ?", (emp_id,))
-        db.commit()
         return jsonify({"message": "Employee restored"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 400
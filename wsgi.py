@@ -0,0 +1,11 @@
+"""WSGI entry point for gunicorn (and other WSGI servers).
+
+Run with: gunicorn --worker-class gthread --workers 2 --threads 8 wsgi:application
+"""
+
+from app import app, init_db
+
+# Safe on every worker boot: init_db is a no-op once the schema version matches
+init_db()
+
+application = app